@@ -12,6 +12,7 @@ keyword equivalents for attributes listed in the `settings.toml` file.
 DEF_FREQ = 600                  # Default delay between uploads in seconds
 DEF_DELAY = 300                 # Default delay before first upload in seconds
 DEF_WAIT = 1                    # Default delay between sensor reads
+DEF_PROX_WAIT = 1               # Default delay between proximity sensor reads
 DEF_THROTTLE = 120              # Default additional delay on 'ThrottlingError'
 DEF_ROUNDING = 2                # Default 'rounding' precision for uploaded data
 # fmt: on
@@ -23,6 +24,7 @@ DEF_ROUNDING = 2                # Default 'rounding' precision for uploaded data
 KWD_FREQ = 'FREQ'
 KWD_DELAY = 'DELAY'
 KWD_WAIT = 'WAIT'
+KWD_PROX_WAIT = 'PROX_WAIT'
 KWD_THROTTLE = 'THROTTLE'
 KWD_ROUNDING = 'ROUNDING'
 
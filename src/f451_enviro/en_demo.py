@@ -31,8 +31,10 @@ import time
 import sys
 import asyncio
 import contextlib
+import functools
 import platform
 
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -67,8 +69,12 @@ APP_SETTINGS = 'en_demo_settings.toml' # Settings for demo
 APP_MIN_SENSOR_READ_WAIT = 1        # Min wait in sec between sensor reads
 APP_MIN_PROG_WAIT = 1               # Remaining min (loop) wait time to display prog bar
 APP_WAIT_1SEC = 1
+APP_MIN_LOOP_WAIT = 0.05            # Min wait in sec between main loop cycles
+APP_SPLASH_WAIT = 5                 # Num sec to show splash screen
 APP_MAX_DATA = 120                  # Max number of data points in the queue
+APP_MAX_BATCH = 600                 # Max number of data points in a single upload
 APP_DELTA_FACTOR = 0.02             # Any change within X% is considered negligable
+APP_WIFI_TTL = 30                   # Num sec to reuse Wi-Fi status
 APP_TOPLBL_LEN = 5                  # Num chars of label to display in top bar
 
 APP_DISPL_MODES = [ 
@@ -124,12 +130,13 @@ class AppRT(f451Common.Runtime):
             data: general data set (used to create CLI UI table rows, etc.)
         """
         # Load settings and initialize logger
-        self.config = f451Common.load_settings(self.appDir.joinpath(self.appSettings))
+        self.config = load_settings(self.appDir.joinpath(self.appSettings))
         self.logger = f451Logger.Logger(self.config, LOGFILE=self.appLog)
 
         self.ioFreq = self.config.get(const.KWD_FREQ, const.DEF_FREQ)
         self.ioDelay = self.config.get(const.KWD_DELAY, const.DEF_DELAY)
         self.ioWait = max(self.config.get(const.KWD_WAIT, const.DEF_WAIT), APP_MIN_SENSOR_READ_WAIT)
+        self.ioProxWait = self.config.get(const.KWD_PROX_WAIT, const.DEF_PROX_WAIT)
         self.ioThrottle = self.config.get(const.KWD_THROTTLE, const.DEF_THROTTLE)
         self.ioRounding = self.config.get(const.KWD_ROUNDING, const.DEF_ROUNDING)
         self.ioUploadAndExit = False
@@ -141,10 +148,14 @@ class AppRT(f451Common.Runtime):
         self.timeSinceUpdate = float(0)
         self.timeUpdate = time.time()
         self.displayUpdate = self.timeUpdate
+        self.proxUpdate = float(0)      # Time for next proximity sensor read
         self.uploadDelay = self.ioDelay
         self.maxUploads = int(cliArgs.uploads)
         self.numUploads = 0
+        self.uploadBatch = deque()      # Data points waiting for upload
+        self.uploadTasks = set()        # Uploads currently in progress
         self.loopWait = APP_WAIT_1SEC   # Wait time between main loop cycles
+        self.exitApp = False            # Set by upload callback if 'ioUploadAndExit'
 
         # Initialize UI for terminal
         self.console = Console() # type: ignore
@@ -167,12 +178,13 @@ class AppRT(f451Common.Runtime):
 
         self.logger.log_debug(f'IO DEL:      {self.ioDelay}')
         self.logger.log_debug(f'IO WAIT:     {self.ioWait}')
+        self.logger.log_debug(f'PROX WAIT:   {self.ioProxWait}')
         self.logger.log_debug(f'IO THROTTLE: {self.ioThrottle}')
 
         # Display Raspberry Pi serial and Wi-Fi status
-        self.logger.log_debug(f'Raspberry Pi serial: {f451Common.get_RPI_serial_num()}')
+        self.logger.log_debug(f'Raspberry Pi serial: {get_RPI_serial_num()}')
         self.logger.log_debug(
-            f'Wi-Fi: {(f451Common.STATUS_YES if f451Common.check_wifi() else f451Common.STATUS_UNKNOWN)}'
+            f'Wi-Fi: {(f451Common.STATUS_YES if check_wifi() else f451Common.STATUS_UNKNOWN)}'
         )
 
         # List CLI args
@@ -224,10 +236,32 @@ appRT = AppRT(APP_NAME, APP_VERSION, APP_NAME_SHORT, APP_LOG, APP_SETTINGS)
 # =========================================================
 #              H E L P E R   F U N C T I O N S
 # =========================================================
+def load_settings(settingsFile):
+    """Load settings from TOML file
+
+    Parsed settings are cached by 'f451Enviro.load_settings()' so repeated
+    calls will only re-parse the file if it has changed since the last call.
+
+    Args:
+        settingsFile: path to settings file
+
+    Returns:
+        'dict' with settings
+    """
+    try:
+        return f451Enviro.load_settings(settingsFile)
+    except (FileNotFoundError, ValueError):
+        sys.exit(f"ERROR: Missing or invalid settings file '{settingsFile}'")
+
+
 async def send_data(*args):
-    """Fake 'send' function"""
+    """Fake 'send' function
+
+    We use 'asyncio.sleep()' to simulate a slow upload so that we don't 
+    block the event loop (and any other uploads) while we wait.
+    """
     print('Fake upload start ...')
-    time.sleep(5)
+    await asyncio.sleep(5)
     print('... fake upload end')
 
 
@@ -235,7 +269,8 @@ async def upload_demo_data(*args, **kwargs):
     """Fake upload function
 
     This helper function simulates parsing and uploading data
-    to some cloud service.
+    to some cloud service. The 'data' value can be a 'list' with
+    multiple data points, which are then sent as a single batch.
 
     Args:
         args:
@@ -259,6 +294,65 @@ async def upload_demo_data(*args, **kwargs):
     await asyncio.gather(*sendQ)
 
 
+@functools.lru_cache(maxsize=4)
+def get_tri_colors(colors=None):
+    """Get (cached) tri-color map
+
+    The color map only depends on the (optional) custom colors, so
+    we build it once and reuse it for every LCD update.
+
+    Args:
+        colors: (optional) 'tuple' with custom colors
+
+    Returns:
+        named 'tuple' with color map
+    """
+    return f451Common.get_tri_colors(colors, True)
+
+
+@functools.lru_cache(maxsize=4)
+def get_RPI_ID(prefix=''):
+    """Get (cached) Raspberry Pi ID
+
+    The ID is based on the Raspberry Pi serial number, which does
+    not change while the app is running. So we only look it up once.
+
+    Args:
+        prefix: (optional) 'str' to prepend to ID
+
+    Returns:
+        'str' with Raspberry Pi ID
+    """
+    return f451Common.get_RPI_ID(prefix)
+
+
+@functools.lru_cache(maxsize=1)
+def get_RPI_serial_num():
+    """Get (cached) Raspberry Pi serial number"""
+    return f451Common.get_RPI_serial_num()
+
+
+_wifiCache = {'status': None, 'expires': float(0)}
+
+
+def check_wifi():
+    """Check (cached) Wi-Fi status
+
+    Unlike the serial number, the Wi-Fi status can change while the
+    app is running. So we only reuse the status for 'APP_WIFI_TTL'
+    seconds before we check it again.
+
+    Returns:
+        'bool' if 'True' then Wi-Fi is up
+    """
+    timeCurrent = time.monotonic()
+    if timeCurrent >= _wifiCache['expires']:
+        _wifiCache['status'] = f451Common.check_wifi()
+        _wifiCache['expires'] = timeCurrent + APP_WIFI_TTL
+
+    return _wifiCache['status']
+
+
 def update_Enviro_LCD_display_mode(app, timeCurrent, proximity):
     """Check 'proximity' value and uodate 'display mode'
     
@@ -280,6 +374,21 @@ def update_Enviro_LCD_display_mode(app, timeCurrent, proximity):
         app.displayUpdate = timeCurrent
 
 
+def _min_max(data):
+    """Create min/max based on all collecxted data
+
+    This will smooth out some hard edges that may occur
+    when the data slice is to short.
+    """
+    scrubbed = [i for i in data if i is not None]
+    return (min(scrubbed), max(scrubbed)) if scrubbed else (0, 0)
+
+
+def _get_color_map(data, colors=None):
+    """Get color map if data has limits"""
+    return get_tri_colors(colors) if all(data.limits) else None
+
+
 def update_Enviro_LCD(enviro, data, colors=None):
     """Update Enviro+ LCD depending on display mode
 
@@ -289,30 +398,22 @@ def update_Enviro_LCD(enviro, data, colors=None):
     Args:
         enviro: hook to Enviro+ object
         data: full data set where we'll grab a slice from the end
-        colors: (optional) custom color map
+        colors: (optional) 'tuple' with custom colors
     """
-
-    def _minMax(data):
-        """Create min/max based on all collecxted data
-
-        This will smooth out some hard edges that may occur
-        when the data slice is to short.
-        """
-        scrubbed = [i for i in data if i is not None]
-        return (min(scrubbed), max(scrubbed)) if scrubbed else (0, 0)
-
-    def _get_color_map(data, colors=None):
-        return f451Common.get_tri_colors(colors, True) if all(data.limits) else None
+    # Skip this if LCD is in 'sleep' mode, as there's 
+    # no point in prepping data that we won't display
+    if enviro.displSleepMode:
+        return
 
     # Check display mode. Each mode corresponds to a data type
     if enviro.displMode == const.DISPL_RNDNUM:
-        minMax = _minMax(data.rndnum.as_tuple().data)
+        minMax = _min_max(data.rndnum.as_tuple().data)
         dataClean = f451Enviro.prep_data(data.rndnum.as_tuple())
         colorMap = _get_color_map(dataClean, colors)
         enviro.display_as_graph(dataClean, minMax, colorMap, APP_TOPLBL_LEN)
 
     elif enviro.displMode == const.DISPL_RNDPCNT:
-        minMax = _minMax(data.rndpcnt.as_tuple().data)
+        minMax = _min_max(data.rndpcnt.as_tuple().data)
         dataClean = f451Enviro.prep_data(data.rndpcnt.as_tuple())
         colorMap = _get_color_map(dataClean, colors)
         enviro.display_as_graph(dataClean, minMax, colorMap, APP_TOPLBL_LEN)
@@ -383,43 +484,39 @@ def collect_data(app, data, timeCurrent):
     Returns:
         'bool' if 'True' then we're done with all loops and we can exit app
     """
-    exitApp = False
-
     # --- Get magic data ---
     #
     newData = app.sensors['FakeSensor'].get_demo_data(2)
-    proximity = app.sensors['Enviro'].get_proximity()
     #
     # ----------------------
 
-    # Is it time to upload data?
-    if app.timeSinceUpdate >= app.uploadDelay:
-        try:
-            asyncio.run(
-                upload_demo_data(
-                    data=newData.rndnum,
-                    deviceID=f451Common.get_RPI_ID(f451Common.DEF_ID_PREFIX),
-                )
-            )
-
-        except KeyboardInterrupt:
-            exitApp = True
-
-        else:
-            # Reset 'uploadDelay' back to normal 'ioFreq' on successful upload
-            app.numUploads += 1
-            app.uploadDelay = app.ioFreq
-            exitApp = exitApp or app.ioUploadAndExit
-            app.logger.log_info(
-                f'Uploaded: Magic #: {round(newData.rndnum, app.ioRounding)}'
+    # We collect all data points between uploads and then
+    # send them as a single batch.
+    app.uploadBatch.append(newData.rndnum)
+
+    # Is it time to upload data? We run the upload as a background task so
+    # that we can keep collecting data while it's in progress. We only allow
+    # one upload at a time though, so that data points are not sent twice.
+    exitApp = (app.maxUploads > 0) and (app.numUploads >= app.maxUploads)
+    if app.timeSinceUpdate >= app.uploadDelay and not (app.uploadTasks or exitApp):
+        # Cap batch size here rather than with 'maxlen' on the queue. Points
+        # keep coming in while an upload is running, and a capped queue would
+        # then drop points from the front that 'upload_done()' expects to be
+        # the ones that were sent.
+        while len(app.uploadBatch) > APP_MAX_BATCH:
+            app.uploadBatch.popleft()
+
+        task = asyncio.create_task(
+            upload_demo_data(
+                data=list(app.uploadBatch),
+                deviceID=get_RPI_ID(f451Common.DEF_ID_PREFIX),
             )
-
-        finally:
-            app.timeUpdate = timeCurrent
-            exitApp = (app.maxUploads > 0) and (app.numUploads >= app.maxUploads)
-
-    # Check 'proximity' value to determine when to toggle display mode
-    update_Enviro_LCD_display_mode(app, timeCurrent, proximity)
+        )
+        task.add_done_callback(
+            functools.partial(upload_done, app, len(app.uploadBatch), newData.rndnum)
+        )
+        app.uploadTasks.add(task)
+        app.timeUpdate = timeCurrent
 
     # Update data set and display to terminal as needed
     data.rndnum.data.append(newData.rndnum)
@@ -430,13 +527,79 @@ def collect_data(app, data, timeCurrent):
     return exitApp
 
 
-def main_loop(app, data):
+def upload_done(app, numPoints, magicNum, task):
+    """Wrap up background upload task
+
+    This callback runs when an upload task is done. On success, we 
+    remove the uploaded data points from the upload batch. Otherwise
+    we keep them so that they're included in the next upload.
+
+    Args:
+        app: application runtime object with config, counters, etc.
+        numPoints: number of data points included in upload
+        magicNum: latest data point included in upload
+        task: completed upload task
+    """
+    app.uploadTasks.discard(task)
+    if task.cancelled():
+        return
+
+    if task.exception() is not None:
+        app.logger.log_error(f'Upload failed: {task.exception()}')
+        return
+
+    # Reset 'uploadDelay' back to normal 'ioFreq' on successful upload
+    app.numUploads += 1
+    app.uploadDelay = app.ioFreq
+    app.exitApp = app.exitApp or app.ioUploadAndExit
+    app.logger.log_info(
+        f'Uploaded: {numPoints} data points - Magic #: {round(magicNum, app.ioRounding)}'
+    )
+    # Only the oldest 'numPoints' data points were sent. Any data points
+    # collected while the upload was running stay in the queue.
+    for _ in range(numPoints):
+        app.uploadBatch.popleft()
+
+
+def get_loop_wait(app, waitForSensor):
+    """Get num sec to wait until next main loop cycle
+
+    We check when the next sensor read, proximity read, upload, and
+    LCD 'sleep' are due, and then wait until the earliest of those.
+    Anything that is already overdue (e.g. an upload that is waiting
+    for the previous upload to finish) is ignored, and we always wait
+    at least 'APP_MIN_LOOP_WAIT' sec.
+
+    Args:
+        app: application runtime object with config, counters, etc.
+        waitForSensor: num sec until next sensor read
+
+    Returns:
+        'float' with num sec to wait
+    """
+    timeCurrent = time.time()
+    waitFor = [app.loopWait, waitForSensor, app.proxUpdate - timeCurrent]
+
+    if not app.uploadTasks:
+        waitFor.append(app.timeUpdate + app.uploadDelay - timeCurrent)
+
+    if not app.sensors['Enviro'].displSleepMode:
+        waitFor.append(app.displayUpdate + app.sensors['Enviro'].displSleepTime - timeCurrent)
+
+    return max(APP_MIN_LOOP_WAIT, min(val for val in waitFor if val > 0))
+
+
+async def main_loop(app, data):
     """Main application loop.
 
     This is where most of the action happens. We continously collect
     data from our sensors, process it, display it, and upload it at
     certain intervals.
 
+    The loop runs as a coroutine on a single event loop, which is kept
+    alive for the entire session. So uploads no longer need to create
+    (and tear down) a new event loop each time.
+
     Args:
         app: application runtime object with config, counters, etc.
         data: main application data queue
@@ -445,34 +608,57 @@ def main_loop(app, data):
     exitApp = False
     waitForSensor = 0
 
-    while not exitApp:
-        try:
-            # fmt: off
-            timeCurrent = time.time()
-            app.timeSinceUpdate = timeCurrent - app.timeUpdate
-            app.sensors['Enviro'].update_sleep_mode(
-                (timeCurrent - app.displayUpdate) > app.sensors['Enviro'].displSleepTime, # Time to sleep?
-                # cliArgs.noLCD,                                                          # Force no LCD?
-                app.sensors['Enviro'].displSleepMode                                      # Already asleep?
-            )
-            # fmt: on
+    # 'asyncio.run()' turns Ctrl-C into a cancellation of this task (at least
+    # on Python 3.11+), so we may see 'CancelledError' rather than a
+    # 'KeyboardInterrupt'. Either way, we let any upload that is still in
+    # progress finish before we exit.
+    try:
+        while not (exitApp or app.exitApp):
+            try:
+                # fmt: off
+                timeCurrent = time.time()
+                app.timeSinceUpdate = timeCurrent - app.timeUpdate
+                app.sensors['Enviro'].update_sleep_mode(
+                    (timeCurrent - app.displayUpdate) > app.sensors['Enviro'].displSleepTime, # Time to sleep?
+                    # cliArgs.noLCD,                                                          # Force no LCD?
+                    app.sensors['Enviro'].displSleepMode                                      # Already asleep?
+                )
+                # fmt: on
+
+                # Check 'proximity' value to determine when to toggle display mode. We
+                # poll the proximity sensor on its own schedule so that it stays
+                # responsive even if we collect other sensor data less frequently.
+                if timeCurrent >= app.proxUpdate:
+                    update_Enviro_LCD_display_mode(
+                        app, timeCurrent, app.sensors['Enviro'].get_proximity()
+                    )
+                    app.proxUpdate = timeCurrent + app.ioProxWait
+
+                # Update Enviro+ prog bar as needed
+                app.sensors['Enviro'].display_progress(app.timeSinceUpdate / app.uploadDelay)
+
+                # Do we need to wait for next sensor read? Or can 
+                # we collect more 'specimen'? :-P
+                if waitForSensor <= 0:
+                    exitApp = collect_data(app, data, timeCurrent)
+                    waitForSensor = max(app.ioWait, APP_MIN_PROG_WAIT)
 
-            # Update Enviro+ prog bar as needed
-            app.sensors['Enviro'].display_progress(app.timeSinceUpdate / app.uploadDelay)
+            except KeyboardInterrupt:
+                exitApp = True
 
-            # Do we need to wait for next sensor read? Or can 
-            # we collect more 'specimen'? :-P
-            if waitForSensor <= 0:
-                exitApp = collect_data(app, data, timeCurrent)
-                waitForSensor = max(app.ioWait, APP_MIN_PROG_WAIT)
+            # Are we done? If not, then we sleep until whatever comes up next
+            # (e.g. sensor read, upload, etc.) but never longer than 'loopWait'
+            # so that the progress bar keeps moving.
+            if not (exitApp or app.exitApp):
+                sleepFor = get_loop_wait(app, waitForSensor)
+                await asyncio.sleep(sleepFor)
+                waitForSensor -= sleepFor
 
-        except KeyboardInterrupt:
-            exitApp = True
+    except asyncio.CancelledError:
+        pass
 
-        # Are we done?
-        if not exitApp:
-            time.sleep(app.loopWait)
-            waitForSensor -= app.loopWait
+    finally:
+        await asyncio.gather(*app.uploadTasks, return_exceptions=True)
 
 
 # =========================================================
@@ -525,10 +711,12 @@ def main(cliArgs=None):  # sourcery skip: extract-method
         )
 
         appRT.sensors['Enviro'].display_message(APP_NAME, COLOR_LOGO_FG, COLOR_LOGO_BG)
-        time.sleep(5)
+        splashEnd = time.time() + APP_SPLASH_WAIT
 
-        # Add fake sensor
+        # Add fake sensor. We do this while the splash screen is
+        # showing and then only wait for whatever time is left.
         appRT.add_sensor('FakeSensor', f451Common.FakeSensor)
+        time.sleep(max(0, splashEnd - time.time()))
 
     except KeyboardInterrupt:
         appRT.sensors['Enviro'].display_reset()
@@ -541,7 +729,7 @@ def main(cliArgs=None):  # sourcery skip: extract-method
     appRT.logger.log_info('-- START Data Logging --')
 
     with contextlib.suppress(KeyboardInterrupt):
-        main_loop(appRT, appData)
+        asyncio.run(main_loop(appRT, appData))
 
     appRT.logger.log_info('-- END Data Logging --')
     #
@@ -7,6 +7,7 @@ random demo data collected in the demo application.
 """
 
 from collections import deque
+from itertools import repeat
 import f451_enviro.enviro_data as f451EnviroData
 
 
@@ -38,14 +39,14 @@ class DemoData:
             'dict' - holds entiure data structure
         """
         self.rndnum = f451EnviroData.EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen),
+            deque(repeat(defVal, maxLen), maxlen=maxLen),
             (45, 155),  # min/max range for valid data
             'km/h',
             [55, 85, 115, 145],
             'Speed',
         )
         self.rndpcnt = f451EnviroData.EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen),
+            deque(repeat(defVal, maxLen), maxlen=maxLen),
             (0, 100),  # min/max range for valid data
             '%',
             [10, 30, 70, 90],
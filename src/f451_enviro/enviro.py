@@ -15,25 +15,36 @@ TODO: there are a few things that will be adeded as needed including:
 
 Dependencies:
  - fonts: https://pypi.org/project/fonts/
+ - NumPy: https://pypi.org/project/numpy/
  - font-roboto: https://pypi.org/project/font-roboto/
  - Pillow: https://pypi.org/project/Pillow/
  - Pimoroni Enviro+ library: https://github.com/pimoroni/enviroplus-python/  
 """
 
+import copy
 import time
 import colorsys
+import threading
 
-from random import randint
-from subprocess import PIPE, Popen
-
+from bisect import bisect_left
+from collections import deque, namedtuple
+from functools import lru_cache
+from pathlib import Path
 
 from . import enviro_data as f451EnviroData
 
+import numpy as np
+
 from PIL import Image
 from PIL import ImageDraw
 from PIL import ImageFont
 from fonts.ttf import RobotoMedium  # type: ignore
 
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
+
 # Support for ST7735 LCD
 try:
     import ST7735
@@ -86,12 +97,19 @@ except ImportError:
 __all__ = [
     'Enviro',
     'EnviroError',
+    'SensorSnapshot',
+    'load_settings',
     'prep_data',
     'DISPL_SPARKLE',
     'KWD_ROTATION',
     'KWD_DISPLAY',
     'KWD_PROGRESS',
     'KWD_SLEEP',
+    'KWD_SENSOR_TTL',
+    'KWD_CPU_TEMP_TTL',
+    'KWD_SPI_SPEED',
+    'KWD_ASYNC_FLUSH',
+    'KWD_PMS_THREAD',
     'KWD_DISPLAY_TOP_X',
     'KWD_DISPLAY_TOP_Y',
     'KWD_DISPLAY_TOP_BAR',
@@ -106,6 +124,16 @@ DEF_ROTATION = 0                # Default display rotation
 DEF_SLEEP = 600                 # Default time to sleep (in seconds)
 DEF_LCD_OFFSET_X = 1            # Default horizontal offset for LCD
 DEF_LCD_OFFSET_Y = 1            # Default vertical offseet for LCD
+DEF_SENSOR_TTL = 0.5            # Default max age (in seconds) of cached BME280 data
+DEF_CPU_TEMP_TTL = 5            # Default max age (in seconds) of cached CPU temp
+DEF_SPI_SPEED = 10000000        # Default SPI speed (in Hz) for LCD
+DEF_ASYNC_FLUSH = False         # Default for sending LCD frames in background thread
+DEF_PMS_THREAD = False          # Default for reading PMS5003 in background thread
+
+CPU_TEMP_FILE = '/sys/class/thermal/thermal_zone0/temp'  # CPU temp in millidegrees C
+
+PMS_RESET_WAIT = 1              # Wait (in seconds) before resetting PMS5003 after timeout
+PMS_READ_WAIT = 0.1             # Min wait (in seconds) between PMS5003 reads in background
 
 STATUS_ON = True
 STATUS_OFF = False
@@ -122,6 +150,9 @@ PROX_LIMIT = 1500               # Threshold for proximity sensor to detect 'tap'
 
 DISPL_SPARKLE = 'sparkles'      # Name of 'sparkles' view :-)
 MAX_SPARKLE_PCNT = 0.05         # 5% sparkles
+RAND_POOL_SIZE = 4096           # Num random values to generate per batch
+
+DEF_SMOOTH_WIN = 3              # Moving average window when replacing outliers
 
 RGB_BLACK = (0, 0, 0)
 RGB_WHITE = (255, 255, 255)
@@ -168,6 +199,11 @@ KWD_ROTATION = 'ROTATION'
 KWD_DISPLAY = 'DISPLAY'
 KWD_PROGRESS = 'PROGRESS'
 KWD_SLEEP = 'SLEEP'
+KWD_SENSOR_TTL = 'SENSOR_TTL'
+KWD_CPU_TEMP_TTL = 'CPU_TEMP_TTL'
+KWD_SPI_SPEED = 'SPI_SPEED'
+KWD_ASYNC_FLUSH = 'ASYNC_FLUSH'
+KWD_PMS_THREAD = 'PMS_THREAD'
 
 KWD_DISPLAY_TOP_X = 'TOP_X'
 KWD_DISPLAY_TOP_Y = 'TOP_Y'
@@ -178,6 +214,24 @@ KWD_DISPLAY_TOP_BAR = 'TOP_BAR'
 # =========================================================
 #                        H E L P E R S
 # =========================================================
+# Sensor values collected in a single pass
+SensorSnapshot = namedtuple('SensorSnapshot', 'temperature pressure humidity proximity gas timestamp')
+
+# Lookup table with 256 RGB colors from blue (0.0) to red (1.0). We use
+# this for data sets that do not have any color map and/or limits.
+_HSV_LUT = np.array(
+    [
+        [int(x * 255.0) for x in colorsys.hsv_to_rgb((1.0 - i / 255) * 0.6, 1.0, 1.0)]
+        for i in range(256)
+    ],
+    dtype=np.uint8,
+)
+
+# Same colors as in 'COLOR_PALETTE', but as array so that we can map 
+# all values in a data set to colors in one go.
+_PALETTE = np.array(COLOR_PALETTE, dtype=np.uint8)
+
+
 class EnviroError(Exception):
     """Custom exception class"""
 
@@ -185,7 +239,155 @@ class EnviroError(Exception):
         super().__init__(errMsg)
 
 
-def prep_data(inData, lenSlice=0):
+@lru_cache(maxsize=None)
+def _get_font(size):
+    """Get Roboto font in given size
+
+    Loading a TrueType font means reading and parsing the font file. So
+    we only do that once per font size and then reuse the font object.
+    """
+    return ImageFont.truetype(RobotoMedium, size)
+
+
+@lru_cache(maxsize=256)
+def _get_text_length(text, size):
+    """Get length (in px) of text in Roboto font in given size
+
+    Measuring text means laying out each glyph. Many messages (e.g.
+    status messages) are shown over and over again, so we cache the
+    results.
+    """
+    return _get_font(size).getlength(text)
+
+
+def _read_CPU_temp():
+    """Read CPU temp (in C) from 'sysfs'
+
+    This is a single file read, which is much cheaper than spawning
+    a 'vcgencmd measure_temp' process.
+    """
+    with open(CPU_TEMP_FILE) as fp:
+        return int(fp.read()) / 1000.0
+
+
+def _to_RGB565(frame):
+    """Pack RGB frame into 16-bit RGB565 values used by ST7735 LCD"""
+    return (
+        ((frame[..., 0].astype(np.uint16) & 0xF8) << 8)
+        | ((frame[..., 1].astype(np.uint16) & 0xFC) << 3)
+        | (frame[..., 2] >> 3)
+    )
+
+
+class _RandPool:
+    """Pool of pre-generated random numbers
+
+    Generating random numbers with NumPy in large batches is much 
+    cheaper than calling 'random.randint()' for every single value.
+    """
+
+    def __init__(self, size=RAND_POOL_SIZE):
+        self._rng = np.random.default_rng()
+        self._size = size
+        self._buf = []
+        self._idx = size
+
+    def randints(self, *ranges):
+        """Get random 'int' for each '(min, max)' range (inclusive)
+
+        If we need more values than the pool holds, then the new batch
+        is made big enough to cover all of them.
+        """
+        num = len(ranges)
+        if self._idx + num > len(self._buf):
+            self._buf = self._rng.random(max(self._size, num)).tolist()
+            self._idx = 0
+
+        vals = self._buf[self._idx:self._idx + num]
+        self._idx += num
+        return [lo + int(u * (hi - lo + 1)) for u, (lo, hi) in zip(vals, ranges)]
+
+
+_RANDPOOL = _RandPool()
+
+
+def _filter_outliers(data, vMin, vMax, iqrFactor, smoothWin):
+    """Replace invalid values and outliers with local moving average
+
+    A value is invalid if it's 'None' or outside the 'vMin'/'vMax' range,
+    and it's an outlier if it's more than 'iqrFactor' times the IQR (i.e.
+    inter-quartile range) away from the median of all valid values. Each
+    of those values is replaced with the average of the valid values 
+    within the moving window around it, or 0 if there are none.
+
+    Args:
+        data: 'list' with values
+        vMin: min valid value
+        vMax: max valid value
+        iqrFactor: max distance from median in IQRs
+        smoothWin: size of moving average window
+
+    Returns:
+        'list' with clean values
+    """
+    if not data:
+        return []
+
+    arr = np.array([np.nan if i is None else i for i in data], dtype=float)
+    mask = (arr >= vMin) & (arr <= vMax)
+    if mask.any():
+        q1, med, q3 = np.percentile(arr[mask], [25, 50, 75])
+        mask &= np.abs(arr - med) <= iqrFactor * (q3 - q1)
+
+    # We use 'full' convolution and slice out the window centered on each value,
+    # as 'same' mode returns 'smoothWin' values when data has fewer values.
+    kernel = np.ones(smoothWin)
+    lo = (smoothWin - 1) // 2
+    total = np.convolve(np.where(mask, arr, 0), kernel, mode='full')[lo:lo + len(arr)]
+    count = np.convolve(mask.astype(float), kernel, mode='full')[lo:lo + len(arr)]
+    smooth = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+    return np.where(mask, arr, smooth).tolist()
+
+
+@lru_cache(maxsize=8)
+def _load_settings_cached(settingsFile, mtime, size):
+    """Parse settings file (memoized on path, modification time, and size)
+
+    We read the whole file in one go and parse it from memory, which
+    is cheaper than letting the TOML parser stream it from a file object.
+    """
+    return tomllib.loads(settingsFile.read_bytes().decode('utf-8'))
+
+
+def load_settings(settingsFile):
+    """Load settings from TOML file
+
+    Parsed settings are cached and keyed on the file path, modification
+    time, and size. So repeated calls will only re-parse the file if it
+    has changed since the last call.
+
+    Args:
+        settingsFile: path to settings file
+
+    Returns:
+        'dict' with settings. This is a (deep) copy, so callers can change
+        it -- including any nested tables -- without affecting the cached
+        settings.
+
+    Raises:
+        'FileNotFoundError' if file does not exist, and 'ValueError' if
+        file is not valid UTF-8 and/or TOML
+    """
+    settingsFile = Path(settingsFile)
+    fileStat = settingsFile.stat()
+
+    settings = _load_settings_cached(settingsFile, fileStat.st_mtime_ns, fileStat.st_size)
+
+    return copy.deepcopy(settings)
+
+
+def prep_data(inData, lenSlice=0, iqrFactor=None, smoothWin=DEF_SMOOTH_WIN):
     """Prep data for Enviro+
 
     This function will filter data to ensure we don't have incorrect
@@ -197,9 +399,15 @@ def prep_data(inData, lenSlice=0):
     we're displaying this data on an 0.96" LCD. So visual 'accuracy' is
     already less than ideal ;-)
 
+    If 'iqrFactor' is set, then we also reject statistical outliers, and
+    we replace all invalid values with a local moving average instead of
+    0's. This avoids sharp 'spikes' in graphs, but is a bit slower.
+
     Args:
         inData: 'DataUnit' named tuple with 'raw' data from sensors
         lenSlice: (optional) length of data slice
+        iqrFactor: (optional) max distance from median (in IQRs) for valid values
+        smoothWin: (optional) size of moving average window for replacement values
 
     Returns:
         'DataUnit' named tuple with the following fields:
@@ -209,49 +417,28 @@ def prep_data(inData, lenSlice=0):
             label  = <label string>,
             limits = [list of limits]
     """
-
-    def _is_valid(val, valid, allowNone=True):
-        """Verify value 'valid'
-
-        This method allows us to verify that a given
-        value falls within the 'valid' ranges are for 
-        a given data set. Any value outside the range 
-        is considered an error and is replaced by a 
-        default value.
-
-        NOTE: This local function is similar to the 'is_valid()' 
-              function in f451 Labs Common library. We have a copy
-              here so that the f451 Labs SenseHat library does not 
-              have another dependency
-
-        Args:
-            val: value to check
-            valid: 'tuple' with min/max values for valid range
-            allowNone: if 'True', then skip compare if 'valid' is 'None
-
-        Returns:
-            'True' if value is valid, else 'False'
-        """
-        if valid is None or not all(valid):
-            return allowNone
-
-        if val is not None and any(valid):
-            isValid = True
-            if valid[0] is not None:
-                isValid &= float(val) >= float(valid[0])
-            if valid[1] is not None:
-                isValid &= float(val) <= float(valid[1])
-
-            return isValid
-
-        return False
-
     # Size of data slice we want to send to Sense HAT. The 'f451 Labs SenseHat'
     # library will ulimately only display the last 8 values anyway.
     dataSlice = list(inData.data)[-lenSlice:]
 
-    # Return filtered data
-    dataClean = [i if _is_valid(i, inData.valid) else 0 for i in dataSlice]
+    # We only filter data if there is a 'valid' range. We check the range
+    # once for the whole set -- rather than once per value -- and then
+    # replace any values outside the range with 0's. Either end of the
+    # range can be 'None', in which case we only check the other end.
+    #
+    # NOTE: This logic is similar to the 'is_valid()' function in f451 Labs
+    #       Common library. We have a copy here so that the f451 Labs Enviro+
+    #       library does not have another dependency.
+    vMin, vMax = inData.valid or (None, None)
+    if iqrFactor is None and vMin is None and vMax is None:
+        dataClean = dataSlice
+    else:
+        vMin = float('-inf') if vMin is None else float(vMin)
+        vMax = float('inf') if vMax is None else float(vMax)
+        if iqrFactor is None:
+            dataClean = [i if i is not None and vMin <= i <= vMax else 0 for i in dataSlice]
+        else:
+            dataClean = _filter_outliers(dataSlice, vMin, vMax, iqrFactor, smoothWin)
 
     return f451EnviroData.DataUnit(
         data=dataClean,
@@ -290,13 +477,20 @@ class Enviro:
         DISPLAY:    Default display mode
         PROGRESS:   Show progress bar - [0 = no, 1 = yes]
         SLEEP:      Number of seconds until LCD goes to screen saver mode
+        SENSOR_TTL: Number of seconds that BME280 data is cached between reads
+        CPU_TEMP_TTL: Number of seconds that CPU temp is cached between reads
+        SPI_SPEED:  SPI bus speed (Hz) for LCD display
+        ASYNC_FLUSH: Send LCD frames from background thread - [0 = no, 1 = yes]
+        PMS_THREAD: Read PMS5003 sensor in background thread - [0 = no, 1 = yes]
         TOP_X:      X coordinate for top-left corner on LCD
         TOP_Y:      Y coordinate for top-left corner on LCD
         TOP_BAR:    Height (in px) of top bar
 
     Methods & Properties:
+        from_settings:      Create 'Enviro' object from 'settings.toml' file
         displayWidth:       Width (pixels) of 0.96" LCD display
         displayHeight:      Height (pixels) of 0.96" LCD display
+        displayModes:       Display modes in order
         isFake:             'False' if physical Enviro+
         get_CPU_temp:       Get CPU temp which we then can use to compensate temp reads
         get_proximity:      Get proximity value from sensor
@@ -306,6 +500,7 @@ class Enviro:
         get_temperature:    Get temperature from sensor
         get_gas_data:       Get gas data from sensor
         get_particles:      Get particle data from sensor
+        read_snapshot:      Get data from all core sensors in a single pass
         add_display_modes:  Add one or more display modes to the list
         set_display_mode:   Switch display mode
         update_sleep_mode:  Switch to/from sleep mode
@@ -340,16 +535,30 @@ class Enviro:
         self._BME280 = BME280(i2c_dev=bus)  # BME280 temperature, pressure, humidity sensor
 
         self._PMS5003 = PMS5003()  # PMS5003 particulate sensor
+        self._pmsBackground = bool(settings.get(KWD_PMS_THREAD, DEF_PMS_THREAD))
+        self._pmsWorker = None  # Background thread for PMS5003 reads (if enabled)
+        self._pmsLock = threading.Lock()  # Ensures we only start 1 background thread
+        self._pmsReady = threading.Event()
+        self._pmsData = None  # Latest PMS5003 data (or error) from background thread
         self._LTR559 = ltr559  # Proximity sensor
         self._GAS = gas  # Enviro+
 
+        self.sensorTTL = settings.get(KWD_SENSOR_TTL, DEF_SENSOR_TTL)
+        self._timeBME280 = None  # Time of last BME280 update
+
+        self.cpuTempTTL = settings.get(KWD_CPU_TEMP_TTL, DEF_CPU_TEMP_TTL)
+        self._cpuTemp = None  # Last CPU temp read
+        self._timeCPUTemp = None  # Time of last CPU temp read
+
         # Initialize LCD and canvas
+        self._LCDLock = threading.Lock()  # Serialize all SPI traffic to LCD
         self._LCD = self._init_LCD(**settings)  # ST7735 0.96" 160x80 LCD
 
         self.displRotation = settings.get(KWD_ROTATION, DEF_ROTATION)
+        self.displSpiSpeed = settings.get(KWD_SPI_SPEED, DEF_SPI_SPEED)
         self.displProgress = bool(settings.get(KWD_PROGRESS, STATUS_ON))
 
-        self.displayModes = [DISPL_SPARKLE]
+        self.displayModes = [DISPL_SPARKLE]     # Also sets index of each mode
         self.displMode = DISPL_SPARKLE
 
         self.displSleepTime = settings.get(KWD_SLEEP, DEF_SLEEP)
@@ -361,9 +570,36 @@ class Enviro:
 
         self._img = None
         self._draw = None
+        self._lastFrame = None  # Last frame sent to LCD (in native LCD orientation)
+
+        # Send frames to LCD in background thread? We only keep the latest
+        # frame in the queue, so slow SPI transfers just skip stale frames.
+        self._flushQ = None
+        if settings.get(KWD_ASYNC_FLUSH, DEF_ASYNC_FLUSH):
+            self._flushQ = deque(maxlen=1)
+            self._flushReady = threading.Event()
+            threading.Thread(target=self._flush_worker, daemon=True).start()
         self._fontLG = None
         self._fontSM = None
 
+    @classmethod
+    def from_settings(cls, settingsFile, **kwargs):
+        """Create 'Enviro' object from settings file
+
+        Settings are parsed once and cached until the file changes.
+        Any 'kwargs' override values from the settings file.
+
+        Args:
+            settingsFile:
+                'str' or 'Path' to TOML file with settings
+            kwargs:
+                individual settings
+
+        Returns:
+            'Enviro' object
+        """
+        return cls(load_settings(settingsFile), **kwargs)
+
     @property
     def displayWidth(self):
         return self._LCD.width
@@ -372,13 +608,40 @@ class Enviro:
     def displayHeight(self):
         return self._LCD.height
 
+    @property
+    def displayModes(self):
+        """'list' of display modes in order"""
+        return self._displModes
+
+    @displayModes.setter
+    def displayModes(self, modes):
+        self._displModes = list(modes)
+        self._displModeIndx = {m: i for i, m in enumerate(self._displModes)}
+
+    def _get_displ_mode_indx(self, mode):
+        """Get index of display mode in 'displayModes'
+
+        The list of display modes is public and can be changed in place. So we
+        rebuild the index if it does not match the list (anymore).
+
+        Returns:
+            'int' with index, or 'None' if mode is not in list
+        """
+        indx = self._displModeIndx.get(mode)
+        if indx is None or indx >= len(self._displModes) or self._displModes[indx] != mode:
+            self._displModeIndx = {m: i for i, m in enumerate(self._displModes)}
+            indx = self._displModeIndx.get(mode)
+
+        return indx
+
     @property
     def isFake(self):
         """Is this 'real' or 'fake' Enviro+?
         
-        Returns 'True' if we use 'fake' Enviro+ libraries
+        Returns 'True' if we use 'fake' Enviro+ libraries. This does not
+        change at runtime, so we check it once when we initialize the LCD.
         """
-        return getattr(self._LCD, 'fake', False)
+        return self._isFake
 
     def _init_LCD(self, **kwargs):
         """Initialize LCD on Enviro+"""
@@ -388,44 +651,102 @@ class Enviro:
             dc=9,
             backlight=12,
             rotation=kwargs.get(KWD_ROTATION, DEF_ROTATION),
-            spi_speed_hz=10000000,
+            spi_speed_hz=int(kwargs.get(KWD_SPI_SPEED, DEF_SPI_SPEED)),
         )
         st7735.begin()
+        self._isFake = getattr(st7735, 'fake', False)
+
+        # Can we send pixel data straight to 'spidev'? Its 'writebytes2()'
+        # takes 'bytes' as-is and splits large buffers into SPI-sized chunks
+        # on its own, so we skip building a 'list' with 1 item per byte.
+        spi = getattr(st7735, '_spi', None)
+        gpio = getattr(ST7735, 'GPIO', None)
+        self._spiWrite = getattr(spi, 'writebytes2', None) if gpio else None
 
         return st7735
 
-    @staticmethod
-    def _scrub(data, default=0):
-        """Scrub 'None' values from data"""
-        return [default if i is None else i for i in data]
+    def _flush(self):
+        """Send LCD image to LCD
 
-    @staticmethod
-    def _clamp(val, minVal=0, maxVal=1):
-        """Clamp values to min/max range"""
-        return min(max(float(minVal), float(val)), float(maxVal))
+        The frame is rotated to native LCD orientation the same way that
+        the ST7735 library does it, as the LCD window uses native (i.e. 
+        unrotated) coordinates. Frames are also packed into RGB565 (i.e. 
+        the native LCD pixel format), so we only compare 2 bytes per pixel
+        and can send the changed window as-is in big-endian byte order.
 
-    @staticmethod
-    def _scale(val, minMax, height):
-        """Scale value to fit on Enviro+ LCD
+        If 'ASYNC_FLUSH' is enabled, then we hand the frame over to the 
+        background thread and return right away.
 
-        This is similar to 'num_to_range()' in f451 Labs Common module,
-        but simplified for fitting values to Enviro+ LCD display dimensions.
+        Nothing is sent to a 'fake' LCD, so we skip all of this then.
         """
-        if minMax is None or minMax[1] == minMax[0]:
-            return 0
+        if self._isFake:
+            return
+
+        frame = _to_RGB565(np.rot90(np.asarray(self._img), self.displRotation // 90))
 
-        return float(val - minMax[0]) / float(minMax[1] - minMax[0]) * height
+        if self._flushQ is None:
+            with self._LCDLock:
+                self._send_frame(frame)
+        else:
+            self._flushQ.append(frame)
+            self._flushReady.set()
+
+    def _flush_worker(self):
+        """Send queued frames to LCD (runs in background thread)"""
+        while True:
+            self._flushReady.wait()
+            self._flushReady.clear()
+            while self._flushQ:
+                frame = self._flushQ.pop()
+                with self._LCDLock:
+                    self._send_frame(frame)
+
+    def _send_frame(self, frame):
+        """Send changed part of RGB565 frame to LCD
+
+        We keep a copy of the last frame sent to the LCD, and then only 
+        send the smallest window that covers all changed pixels. Between
+        two updates, that is often only a few columns and the label at
+        the top.
+
+        Args:
+            frame: 'ndarray' with RGB565 values in native LCD orientation
+        """
+        if self._lastFrame is None or self._lastFrame.shape != frame.shape:
+            y0, x0 = 0, 0
+            y1, x1 = frame.shape[0] - 1, frame.shape[1] - 1
+        else:
+            changed = frame != self._lastFrame
+            rows = np.flatnonzero(changed.any(axis=1))
+            if not rows.size:
+                return
+
+            cols = np.flatnonzero(changed.any(axis=0))
+            y0, y1, x0, x1 = int(rows[0]), int(rows[-1]), int(cols[0]), int(cols[-1])
+
+        buf = frame[y0:y1 + 1, x0:x1 + 1].astype('>u2').tobytes()
+        self._LCD.set_window(x0, y0, x1, y1)
+        if self._spiWrite is None:
+            self._LCD.data(list(buf))
+        else:
+            ST7735.GPIO.output(self._LCD._dc, True)  # DC pin 'high' for data
+            self._spiWrite(buf)
+        self._lastFrame = frame
+
+    @staticmethod
+    def _scrub(data, default=0):
+        """Scrub 'None' values from data"""
+        return [default if i is None else i for i in data]
 
     @staticmethod
     def _get_rgb(val):
-        """Get a color value using 'colorsys' library
+        """Get a color value from pre-computed lookup table
         
         We use this method if there is no color map and/or 
         no limits are defined for a give data set.
         """
         # Convert the values to colors from red to blue
-        color = (1.0 - val) * 0.6
-        return tuple(int(x * 255.0) for x in colorsys.hsv_to_rgb(color, 1.0, 1.0))
+        return tuple(_HSV_LUT[int(val * 255)].tolist())
 
     @staticmethod
     def _get_rgb_from_map(val, limits, colorMap):
@@ -436,6 +757,9 @@ class Enviro:
         against the color map, as the color map limits use actual 
         (full-scale) values.
 
+        If there is no color map, then we map the value against all limits
+        and use the 5 colors in the default 'COLOR_PALETTE'.
+
         Args:
             val: value to map
             limits: 'list' with limits
@@ -444,17 +768,33 @@ class Enviro:
         Returns:
             'tuple' with RGB as '(R, G, B)'
         """
-        if val > round(limits[2], 1):
-            return colorMap.high
-        elif val <= round(limits[1], 1):
-            return colorMap.low
-        else:
-            return colorMap.normal
+        if colorMap is None:
+            return COLOR_PALETTE[bisect_left([round(i, 1) for i in sorted(limits)], val)]
+
+        band = bisect_left((round(limits[1], 1), round(limits[2], 1)), val)
+        return (colorMap.low, colorMap.normal, colorMap.high)[band]
+
+    def _update_BME280(self, raw=False):
+        """Update BME280 data unless cached data is still fresh
+
+        The BME280 reads temperature, pressure, and humidity in a single
+        burst. We keep those values for 'sensorTTL' seconds so that
+        back-to-back reads don't each trigger a full I2C transaction.
+
+        Args:
+            raw: if 'True', then always read new data from sensor
+        """
+        timeCurrent = time.monotonic()
+        if raw or self._timeBME280 is None or (timeCurrent - self._timeBME280) >= self.sensorTTL:
+            self._BME280.update_sensor()
+            self._timeBME280 = timeCurrent
 
-    def get_CPU_temp(self, strict=True):
+    def get_CPU_temp(self, strict=True, raw=False):
         """Get CPU temp
 
         We use this for compensating temperature reads from BME280 sensor.
+        CPU temp changes slowly, so we keep the value for 'cpuTempTTL' 
+        seconds before we read it again.
 
         Based on code from Enviro+ example 'luftdaten_combined.py'
 
@@ -463,13 +803,19 @@ class Enviro:
                 If 'True', then we raise an exception, else we simply
                 return 'regular' temperature (from BME280) if the
                 exceptions is 'FileNotFoundError'
+            raw:
+                If 'True', then always read new CPU temp
         Raises:
-            Same exceptions as 'Popen'
+            Same exceptions as 'open'
         """
+        timeCurrent = time.monotonic()
+        if not raw and self._timeCPUTemp is not None and (timeCurrent - self._timeCPUTemp) < self.cpuTempTTL:
+            return self._cpuTemp
+
         try:
-            process = Popen(['vcgencmd', 'measure_temp'], stdout=PIPE, universal_newlines=True)
-            output, _error = process.communicate()
-            return float(output[output.index('=') + 1 : output.rindex("'")])
+            self._cpuTemp = _read_CPU_temp()
+            self._timeCPUTemp = timeCurrent
+            return self._cpuTemp
 
         except FileNotFoundError:
             if not strict:
@@ -485,41 +831,118 @@ class Enviro:
         """Get illumination from LTR559 sensor"""
         return self._LTR559.get_lux()
 
-    def get_pressure(self):
-        """Get air pressure data from BME280 sensor"""
-        return self._BME280.get_pressure()
+    def get_pressure(self, raw=False):
+        """Get air pressure data from BME280 sensor
+
+        Args:
+            raw: if 'True', then skip cached data and read from sensor
+        """
+        self._update_BME280(raw)
+        return self._BME280.pressure
 
-    def get_humidity(self):
-        """Get humidity data from BME280 sensor"""
-        return self._BME280.get_humidity()
+    def get_humidity(self, raw=False):
+        """Get humidity data from BME280 sensor
 
-    def get_temperature(self):
-        """Get temperature data from BME280"""
-        return self._BME280.get_temperature()
+        Args:
+            raw: if 'True', then skip cached data and read from sensor
+        """
+        self._update_BME280(raw)
+        return self._BME280.humidity
+
+    def get_temperature(self, raw=False):
+        """Get temperature data from BME280
+
+        Args:
+            raw: if 'True', then skip cached data and read from sensor
+        """
+        self._update_BME280(raw)
+        return self._BME280.temperature
 
     def get_gas_data(self):
         return self._GAS.read_all()
 
-    def get_particles(self):
-        """Get particle data from PMS5003"""
+    def _read_PMS5003(self):
+        """Read data from PMS5003 and reset sensor on timeout"""
         try:
-            data = self._PMS5003.read()
+            return self._PMS5003.read()
 
         except pmsReadTimeoutError:
-            time.sleep(1)
+            time.sleep(PMS_RESET_WAIT)
             self._PMS5003.reset()
-            data = self._PMS5003.read()
+            return self._PMS5003.read()
+
+    def _PMS5003_worker(self):
+        """Keep reading PMS5003 data (runs in background thread)"""
+        while True:
+            try:
+                self._pmsData = self._read_PMS5003()
+
+            except Exception as e:
+                self._pmsData = e
+
+            self._pmsReady.set()
+            time.sleep(PMS_READ_WAIT)
+
+    def get_particles(self):
+        """Get particle data from PMS5003
+
+        Each PMS5003 read can block for a second or more. So if 'PMS_THREAD'
+        is enabled, then we read the sensor in a background thread, and we 
+        return the latest data right away. The thread starts on the first
+        call, and that call waits for the first data from the sensor.
+        """
+        try:
+            if not self._pmsBackground:
+                return self._read_PMS5003()
+
+            with self._pmsLock:
+                if self._pmsWorker is None:
+                    self._pmsWorker = threading.Thread(target=self._PMS5003_worker, daemon=True)
+                    self._pmsWorker.start()
+            self._pmsReady.wait()
+
+            data = self._pmsData
+            if isinstance(data, Exception):
+                raise data
 
         except SerialTimeoutError as e:
             raise EnviroError(f'PMS5003 Error: {e}') from e
 
         return data
 
+    def read_snapshot(self):
+        """Get data from all core sensors in a single pass
+
+        The BME280 reads temperature, pressure, and humidity in the same
+        burst. So we update the sensor once (unless cached data is still
+        fresh) and then grab all 3 values, instead of paying for a full
+        I2C transaction for each value.
+
+        Returns:
+            'SensorSnapshot' named tuple with the following fields:
+                temperature = <temperature in C>,
+                pressure    = <pressure in hPa>,
+                humidity    = <humidity in %>,
+                proximity   = <proximity value>,
+                gas         = <gas data>,
+                timestamp   = <time when data was read>
+        """
+        self._update_BME280()
+
+        return SensorSnapshot(
+            temperature=self._BME280.temperature,
+            pressure=self._BME280.pressure,
+            humidity=self._BME280.humidity,
+            proximity=self._LTR559.get_proximity(),
+            gas=self._GAS.read_all(),
+            timestamp=time.time(),
+        )
+
     def add_displ_modes(self, modes):
         """Add list of display modes to existing list
         
-        We combine the lists, convert them to a set to ensure that
-        there are no duplicates, and then convert back to a list.
+        New modes are added in the given order, and we skip any
+        modes that are already in the list.
 
         Args:
             modes: list of one or more view names
@@ -529,7 +952,10 @@ class Enviro:
         if isinstance(modes, str):
             modes = [modes]
         
-        self.displayModes = list(set(self.displayModes + modes))
+        for mode in modes:
+            if self._get_displ_mode_indx(mode) is None:
+                self._displModeIndx[mode] = len(self._displModes)
+                self._displModes.append(mode)
 
     def set_display_mode(self, mode):
         """Change LED display mode
@@ -545,22 +971,18 @@ class Enviro:
         newMode = DISPL_SPARKLE
 
         # Did we get a string? Check if it's a valid view.
-        if isinstance(mode, str) and mode in self.displayModes:
+        if isinstance(mode, str) and self._get_displ_mode_indx(mode) is not None:
             newMode = mode
 
-        # Or did we get 'direction' ? Then loop to prev/next view.
-        elif isinstance(mode, int):
-            displMax = max(0, len(self.displayModes) - 1)
-            
-            newModeIndx = self.displayModes.index(self.displMode)
-            newModeIndx += (-1 if int(mode) < 0 else 1)
-
-            if newModeIndx > displMax:
-                newModeIndx = 0
-            elif newModeIndx < 0:
-                newModeIndx = displMax
-
-            newMode = self.displayModes[newModeIndx]
+        # Or did we get 'direction' ? Then loop to prev/next view. If current
+        # mode is no longer in the list, then we start at the first mode.
+        elif isinstance(mode, int) and self._displModes:
+            currIndx = self._get_displ_mode_indx(self.displMode)
+            if currIndx is None:
+                newMode = self._displModes[0]
+            else:
+                newModeIndx = currIndx + (-1 if int(mode) < 0 else 1)
+                newMode = self._displModes[newModeIndx % len(self._displModes)]
 
         self.displMode = newMode
 
@@ -597,9 +1019,11 @@ class Enviro:
         """
         self._img = Image.new('RGB', (self._LCD.width, self._LCD.height), color=RGB_BLACK)
         self._draw = ImageDraw.Draw(self._img)
-        self._fontLG = ImageFont.truetype(RobotoMedium, FONT_SIZE_LG)
-        self._fontMD = ImageFont.truetype(RobotoMedium, FONT_SIZE_MD)
-        self._fontSM = ImageFont.truetype(RobotoMedium, FONT_SIZE_SM)
+        with self._LCDLock:
+            self._lastFrame = None
+        self._fontLG = _get_font(FONT_SIZE_LG)
+        self._fontMD = _get_font(FONT_SIZE_MD)
+        self._fontSM = _get_font(FONT_SIZE_SM)
 
     def display_rotate(self, direction, step180=False):
         """Rotate LED display
@@ -625,9 +1049,18 @@ class Enviro:
         else:
             self.displRotation = 0 if self.displRotation >= 270 else self.displRotation + ROTATE_90
 
+        # The ST7735 library rotates frames in software and never changes the
+        # LCD memory access order (MADCTL), and '_flush()' rotates frames on
+        # its own anyway. So we only need to update the rotation that the LCD
+        # uses for 'width' and 'height', and can skip a full LCD re-init.
         # fmt: off
-        # Rotate as needed
-        self._LCD = self._init_LCD(ROTATION=self.displRotation) # Re-init LCD to change rotation
+        with self._LCDLock:
+            if hasattr(self._LCD, '_rotation'):
+                self._LCD._rotation = self.displRotation
+            else:
+                self._LCD = self._init_LCD(                     # Re-init LCD to change rotation
+                    ROTATION=self.displRotation, SPI_SPEED=self.displSpiSpeed
+                )
         self.display_init()                                     # Also need to re-init display as 
                                                                 # this changes aspect ratio, etc.
         #fmt: on
@@ -639,7 +1072,8 @@ class Enviro:
     def display_on(self):
         """Turn 'on' LCD display"""
         if not self.isFake:
-            self._LCD.display_on()
+            with self._LCDLock:
+                self._LCD.display_on()
         self.displSleepMode = False     # Reset 'sleep mode' flag
         # self.display_blank()          # Clear LCD
 
@@ -647,15 +1081,20 @@ class Enviro:
         """Turn 'off' LCD display"""
         if not self.isFake:
             self.display_blank()        # Clear LCD
-            self._LCD.display_off()
+            with self._LCDLock:
+                self._LCD.display_off()
         self.displSleepMode = True      # Set 'sleep mode' flag
 
     def display_blank(self):
         """Show clear/blank LCD"""
         # Skip this if we're in 'sleep' mode
         if not (self.isFake or self.displSleepMode):
-            self._img = Image.new('RGB', (self._LCD.width, self._LCD.height), color=RGB_BLACK)
-            self._draw = ImageDraw.Draw(self._img)
+            if self._img is None:
+                self._img = Image.new('RGB', (self._LCD.width, self._LCD.height), color=RGB_BLACK)
+                self._draw = ImageDraw.Draw(self._img)
+            else:
+                self._img.paste(RGB_BLACK, (0, 0, *self._img.size))
+            self._flush()
 
     def display_reset(self):
         """Reset and clear LCD"""
@@ -679,7 +1118,8 @@ class Enviro:
             minMax:
                 'tuple' with min/max values. If 'None' then calculate locally.
             colorMap:
-                'tuple' (optional) custom color map to use if data has defined 'limits'
+                'tuple' (optional) custom color map to use if data has defined 'limits'.
+                If 'None', then we use the 5 colors in 'COLOR_PALETTE' instead.
             lblLen:
                 'int' (optional) number of chars of label to display on top row
             default:
@@ -711,35 +1151,58 @@ class Enviro:
         yProg = (PBAR_HEIGHT if (self.displProgress) else 0)
         yMin = DISPL_TOP_BAR
         yMax = displHeight - yMin - yProg
+
+        # 'NaN' values (e.g. from sensors without 'valid' range) are shown
+        # the same way as 'None' values.
+        vals = np.asarray(values, dtype=float)
+        vals = np.where(np.isnan(vals), float(default), vals)
+
         if minMax is None or minMax[1] == minMax[0]:
-            vMin = min(values) if minMax is None else minMax[0]
-            vMax = max(values) if minMax is None else minMax[1]
+            vMin = vals.min() if minMax is None else minMax[0]
+            vMax = vals.max() if minMax is None else minMax[1]
         else:
             vMin, vMax = minMax
 
-        fitted = [int(self._clamp(self._scale(v, (vMin, vMax), yMax), yMin, yMax)) for v in values]
-        self._draw.rectangle((0, 0, displWidth, displHeight - 1 - yProg), RGB_BLACK)
+        # Scale values to fit LCD. This is similar to 'num_to_range()' in 
+        # f451 Labs Common module, but simplified for Enviro+ LCD dimensions.
+        vRange = float(vMax - vMin) or np.inf
+        fitted = np.clip((vals - vMin) / vRange * yMax, yMin, yMax).astype(int)
 
         # Get colors based on limits and color map? Or generate based on
         # value itself compared to defined limits?
         if all(data.limits):
-            colors = [self._get_rgb_from_map(v, data.limits, colorMap) for v in values]
+            # Band index for each value is the number of (rounded) limits below
+            # the value. Without a color map, we use all limits and the 5-band
+            # default palette. Otherwise we use the 'low/normal/high' bands.
+            if colorMap is None:
+                palette, limits = _PALETTE, data.limits
+            else:
+                palette = np.array((colorMap.low, colorMap.normal, colorMap.high), dtype=np.uint8)
+                limits = data.limits[1:3]
+            colors = palette[np.searchsorted([round(i, 1) for i in sorted(limits)], vals)]
         else:
             # Scale incoming values to be between 0 and 1. We may need to clamp 
             # values when values are outside min/max for current sub-set. This 
             # can happen when original data set has more values than the chunk 
             # that we display on the Enviro+ LCD.
-            scaled = [self._clamp((v - vMin + 1) / (vMax - vMin + 1)) for v in values]
-            colors = [self._get_rgb(v) for v in scaled]
-
-        for i in range(len(fitted)):
-            self._draw.rectangle((i, (displHeight - fitted[i]), i + 1, displHeight - 1 - yProg), colors[i]) # type: ignore
+            scaled = np.clip((vals - vMin + 1) / (vMax - vMin + 1), 0, 1)
+            colors = _HSV_LUT[(scaled * 255).astype(int)]
+
+        # Build graph area (i.e. everything above progress bar) as a single 
+        # RGB frame and paste that onto the LCD image. Each bar is 2 pixels 
+        # wide and partially covered by its right-hand neighbour.
+        yBottom = displHeight - yProg
+        frame = np.zeros((yBottom, displWidth, 3), dtype=np.uint8)
+        mask = (np.arange(yBottom)[:, None] >= (displHeight - fitted)[None, :])[..., None]
+        np.copyto(frame[:, 1:], colors[None, :-1], where=mask[:, :-1])
+        np.copyto(frame, colors[None], where=mask)
+        self._img.paste(Image.frombuffer('RGB', (displWidth, yBottom), frame.tobytes(), 'raw', 'RGB', 0, 1)) # type: ignore
 
         # Write the text at the top in black
         message = f'{data.label[:lblLen]}: {values[-1]:.1f} {data.unit}'
         self._draw.text((0, 0), message, font=self._fontMD, fill=COLOR_TXT)
 
-        self._LCD.display(self._img)
+        self._flush()
 
     def display_as_text(self, data, lblLen=DISPL_LBL_LEN):
         """Display data points as text in columns
@@ -765,14 +1228,18 @@ class Enviro:
         displWidth = self.displayWidth
         displHeight = self.displayHeight
         yProg = (PBAR_HEIGHT if (self.displProgress) else 0)
-        self._draw.rectangle((0, 0, displWidth, displHeight - 1 - yProg), RGB_BLACK)
+        self._img.paste(RGB_BLACK, (0, 0, displWidth, displHeight - yProg))
 
+        # Fill columns top-to-bottom. We round 'rows' up so that
+        # an odd number of items still fits in the given columns.
         cols = 2
-        rows = len(data) / cols
+        rows = max(-(-len(data) // cols), 1)
+        colW = displWidth // cols
+        rowH = displHeight // rows
 
         for idx, item in enumerate(data):
-            x = DEF_LCD_OFFSET_X + ((displWidth // cols) * (idx // rows))
-            y = DEF_LCD_OFFSET_Y + ((displHeight / rows) * (idx % rows))
+            x = DEF_LCD_OFFSET_X + colW * (idx // rows)
+            y = DEF_LCD_OFFSET_Y + rowH * (idx % rows)
 
             if all(item['limits']):
                 rgb = self._get_rgb_from_map(item['dataPt'], item['limits'], item['colorMap'])
@@ -783,7 +1250,7 @@ class Enviro:
             self._draw.text((x, y), message, font=self._fontSM, fill=rgb)
 
         # Display results
-        self._LCD.display(self._img)
+        self._flush()
 
     def display_message(self, msg, fgCol=None, bgCol=None):
         """Display text message
@@ -807,10 +1274,10 @@ class Enviro:
         fgCol = fgCol or RGB_WHITE
 
         yProg = (PBAR_HEIGHT if (self.displProgress) else 0)
-        self._draw.rectangle((0, 0, displWidth, displHeight - 1 - yProg), bgCol)
+        self._img.paste(bgCol, (0, 0, displWidth, displHeight - yProg))
 
         # How long is text?
-        txtLen = self._draw.textlength(str(msg), font=self._fontLG)
+        txtLen = _get_text_length(str(msg), FONT_SIZE_LG)
 
         # Draw message
         x = DEF_LCD_OFFSET_X
@@ -823,7 +1290,7 @@ class Enviro:
             self._draw.text((x, y), str(msg), font=self._fontLG, fill=fgCol)
 
         # Display results
-        self._LCD.display(self._img)
+        self._flush()
 
     def display_progress(self, inFrctn=0.0):
         """Update progressbar on LCD
@@ -850,10 +1317,18 @@ class Enviro:
         self._draw.rectangle((0, yProg + 1, x, displHeight - 1), COLOR_PBAR)
 
         # Display results
-        self._LCD.display(self._img)
+        self._flush()
 
-    def display_sparkle(self):
-        """Show random sparkles on LCD"""
+    def display_sparkle(self, num=1):
+        """Show random sparkles on LCD
+
+        We can add several sparkles in one go, which is cheaper than adding
+        them one at a time, as we then only need to send 1 update to the LCD.
+        The LCD is cleared about as often per sparkle regardless of 'num'.
+
+        Args:
+            num: (optional) number of sparkles to add (max 'MAX_SPARKLE_PCNT' of LCD)
+        """
         # Skip this if we're in 'sleep' mode
         if self.displSleepMode:
             return
@@ -863,18 +1338,18 @@ class Enviro:
         displHeight = self.displayHeight
         yProg = (PBAR_HEIGHT if (self.displProgress) else 0)
 
-        # Create sparkles
-        x = randint(0, displWidth - 1)
-        y = randint(0, displHeight - 1 - yProg)
-        r = randint(0, 255)
-        g = randint(0, 255)
-        b = randint(0, 255)
-
         # Do we want to clear the screen? Or add more sparkles?
-        maxSparkle = int(displWidth * displHeight * MAX_SPARKLE_PCNT)
-        if randint(0, maxSparkle):
-            self._draw.point((x, y), (r, g, b))
+        maxSparkle = max(1, int(displWidth * displHeight * MAX_SPARKLE_PCNT))
+        num = max(1, min(num, maxSparkle))
+        if _RANDPOOL.randints((0, maxSparkle // num))[0]:
+            for _ in range(num):
+                x, y, r, g, b = _RANDPOOL.randints(
+                    (0, displWidth - 1), 
+                    (0, displHeight - 1 - yProg), 
+                    (0, 255), (0, 255), (0, 255), 
+                )
+                self._draw.point((x, y), (r, g, b))
         else:
-            self._draw.rectangle((0, 0, displWidth, displHeight - 1 - yProg), RGB_BLACK)
+            self._img.paste(RGB_BLACK, (0, 0, displWidth, displHeight - yProg))
 
-        self._LCD.display(self._img)
+        self._flush()
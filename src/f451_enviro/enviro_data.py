@@ -6,9 +6,13 @@ are also methods to support conversion between units, etc.
 
 Dependencies:
     - deque - double-ended queue from 'collections' library
+    - NumPy: https://pypi.org/project/numpy/
 """
 
 from collections import deque, namedtuple
+from itertools import repeat
+
+import numpy as np
 
 __all__ = [
     'EnviroData',
@@ -53,6 +57,9 @@ class EnviroObject:
         as_tuple: return data attributes as 'namedtuple' 'DataUnit'
     """
 
+    # Fixed set of attributes, so no per-instance '__dict__'
+    __slots__ = ('data', 'valid', 'unit', 'limits', '_label', '_labelCap')
+
     def __init__(self, data, valid, unit, limits, label):
         self.data = data
         self.valid = valid
@@ -60,19 +67,30 @@ class EnviroObject:
         self.limits = limits
         self.label = label
 
+    @property
+    def label(self):
+        return self._label
+
+    @label.setter
+    def label(self, label):
+        # We also keep capitalized version of label, so that we do
+        # not need to re-create it each time we call 'as_dict()'.
+        self._label = label
+        self._labelCap = label.capitalize()
+
     def as_dict(self):
         """Return data object as 'dict' with each attribute as key."""
         return {
             'data': self.data,
             'valid': self.valid,
             'unit': self.unit,
-            'label': self.label.capitalize(),
+            'label': self._labelCap,
             'limits': self.limits,
         }
 
     def as_tuple(self):
         """Return data object as 'namedtuple' 'DataUnit' with each attribute as key."""
-        return DataUnit(**self.as_dict())
+        return DataUnit(self.data, self.valid, self.unit, self._labelCap, self.limits)
 
 
 class TemperatureObject(EnviroObject):
@@ -89,8 +107,7 @@ class TemperatureObject(EnviroObject):
         as_tuple: return data attributes as 'namedtuple' 'DataUnit'
     """
 
-    def __init__(self, data, valid, unit, limits, label):
-        super().__init__(data, valid, unit, limits, label)
+    __slots__ = ()
 
     def as_dict(self, unit=TEMP_UNIT_C):
         """Return object as 'dict' with temp in C, F, or K
@@ -100,10 +117,11 @@ class TemperatureObject(EnviroObject):
                   if "F"            -"-          in Fahrenheit
                   if "K"            -"-          in Kelvin
         """
-        if unit == TEMP_UNIT_F:
-            data = [self._convert_C2F(c) for c in self.data]
-        elif unit == TEMP_UNIT_K:
-            data = [self._convert_C2K(c) for c in self.data]
+        # We convert all data points in one go, which is a lot faster
+        # than converting them one at a time in a Python loop.
+        if unit in (TEMP_UNIT_F, TEMP_UNIT_K):
+            convert = self._convert_C2F if unit == TEMP_UNIT_F else self._convert_C2K
+            data = convert(np.fromiter(self.data, dtype=float, count=len(self.data))).tolist()
         else:
             data = self.data
 
@@ -111,23 +129,19 @@ class TemperatureObject(EnviroObject):
             'data': data,
             'valid': self.valid,
             'unit': self.unit,
-            'label': self.label.capitalize(),
+            'label': self._labelCap,
             'limits': self.limits,
         }
 
-    def as_tuple(self):
-        """Return data object as 'namedtuple' 'DataUnit' with each attribute as key."""
-        return DataUnit(**self.as_dict())
-
     @staticmethod
     def _convert_C2F(celsius):
-        """Convert Celsius to Fahrenheit"""
+        """Convert Celsius to Fahrenheit (single value or NumPy array)"""
         return (celsius * 9 / 5) + 32.0
 
     @staticmethod
     def _convert_C2K(celsius):
-        """Convert Celsius to Kelvin"""
-        return float(celsius) + 273.15
+        """Convert Celsius to Kelvin (single value or NumPy array)"""
+        return celsius + 273.15
 
 
 class EnviroData:
@@ -168,10 +182,26 @@ class EnviroData:
     Methods:
         as_list: returns a 'list' with data from each attribute as 'list'
         as_dict: returns a 'dict' with data from each attribute as 'dict'
+        to_numpy: returns data for one attribute as NumPy array
         convert_C2F: static (wrapper) method. Converts Celsius to Fahrenheit
         convert_C2K: static (wrapper) method. Converts Celsius to Kelvin
     """
 
+    # Names of sensor attributes. This also sets order of data in both
+    # 'as_list()' and 'as_dict()'.
+    _SENSORS = (
+        'temperature',
+        'pressure',
+        'humidity',
+        'light',
+        'oxidised',
+        'reduced',
+        'nh3',
+        'pm1',
+        'pm25',
+        'pm10',
+    )
+
     def __init__(self, defVal, maxLen):
         """Initialize data structurte.
 
@@ -184,70 +214,70 @@ class EnviroData:
         """
         # fmt: off
         self.temperature = TemperatureObject(
-            deque([defVal] * maxLen, maxlen=maxLen),
+            deque(repeat(defVal, maxLen), maxlen=maxLen),
             (0, 65),        # TODO: Enviro+ temp sensor (STMicro LPS25HB) range 0-65°C (±2°C)
             'C', 
             [4, 18, 25, 35], 
             'Temperature'
         )
         self.pressure = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (260, 1260),    # TODO: Enviro+ pressure sensor (STMicro LPS25HB) range 260-1260 hPa
             'hPa', 
             [250, 650, 1013.25, 1015], 
             'Pressure'
         )
         self.humidity = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (0, 100),       # TODO: Enviro+ humidity sensor (STMicro HTS221) range 0-100%
             '%', 
             [20, 30, 60, 70], 
             'Humidity'
         )
         self.light = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ color/brightness sensor (TCS3400)
             'Lux', 
             [-1, -1, 30000, 100000], 
             'Light'
         )
         self.oxidised = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'kO', 
             [-1, -1, 40, 50], 
             'Oxidized'
         )
         self.reduced = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'kO', 
             [-1, -1, 450, 550], 
             'Reduced'
         )
         self.nh3 = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'kO', 
             [-1, -1, 200, 300], 
             'NH3'
         )
         self.pm1 = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'ug/m3', 
             [-1, -1, 50, 100], 
             'PM1'
         )
         self.pm25 = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'ug/m3', 
             [-1, -1, 50, 100], 
             'PM25'
         )
         self.pm10 = EnviroObject(
-            deque([defVal] * maxLen, maxlen=maxLen), 
+            deque(repeat(defVal, maxLen), maxlen=maxLen), 
             (None, None),   # TODO: Enviro+ ???
             'ug/m3', 
             [-1, -1, 50, 100], 
@@ -255,32 +285,38 @@ class EnviroData:
         )
 
     def as_list(self, tempUnit=TEMP_UNIT_C):
+        # Only temperature supports different units
         return [
-            self.temperature.as_dict(tempUnit),
-            self.pressure.as_dict(),
-            self.humidity.as_dict(),
-            self.light.as_dict(),
-            self.oxidised.as_dict(),
-            self.reduced.as_dict(),
-            self.nh3.as_dict(),
-            self.pm1.as_dict(),
-            self.pm25.as_dict(),
-            self.pm10.as_dict(),
+            getattr(self, name).as_dict(tempUnit)
+            if name == 'temperature'
+            else getattr(self, name).as_dict()
+            for name in self._SENSORS
         ]
 
     def as_dict(self, tempUnit=TEMP_UNIT_C):
-        return {
-            'temperature': self.temperature.as_dict(tempUnit),
-            'pressure': self.pressure.as_dict(),
-            'humidity': self.humidity.as_dict(),
-            'light': self.light.as_dict(),
-            'oxidised': self.oxidised.as_dict(),
-            'reduced': self.reduced.as_dict(),
-            'nh3': self.nh3.as_dict(),
-            'pm1': self.pm1.as_dict(),
-            'pm25': self.pm25.as_dict(),
-            'pm10': self.pm10.as_dict(),
-        }
+        # Same data as 'as_list()', so we just add the attribute names
+        return dict(zip(self._SENSORS, self.as_list(tempUnit)))
+
+    def to_numpy(self, sensor):
+        """Get data points for a sensor as NumPy array
+
+        This is a single copy of the queue into a contiguous 'float' array,
+        which can be passed as-is to NumPy, PIL, plotting libraries, etc.
+        Any 'None' values are converted to 'NaN'.
+
+        Args:
+            sensor: 'str' with sensor attribute name (e.g. 'temperature')
+
+        Returns:
+            'ndarray' with data points (oldest first)
+
+        Raises:
+            'ValueError' if sensor name is not valid
+        """
+        if sensor not in self._SENSORS:
+            raise ValueError(f"Invalid sensor name '{sensor}'")
+
+        return np.array(getattr(self, sensor).data, dtype=float)
 
     def convert_C2F(self, celsius):
         return self.temperature._convert_C2F(celsius)
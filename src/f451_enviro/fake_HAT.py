@@ -8,6 +8,8 @@ random values within the limits of the actual hardware.
 
 import random
 
+from collections import namedtuple
+
 # fmt: off
 # =========================================================
 #              M I S C .   C O N S T A N T S
@@ -25,6 +27,10 @@ LTR559_PROX = 1500
 
 PMS5003_MIN = 0.3           # Unit: um
 PMS5003_MAX = 10.1          # [>0.3, >0.5, >1.0, >2.5, >10]
+PMS5003_SIZES = (1.0, 2.5, 10)  # Particle sizes (um) for 'pm_ug_per_m3()'
+
+GAS_MIN = 10000             # Unit: Ohm
+GAS_MAX = 24000
 
 ST7735_WIDTH = 160
 ST7735_HEIGHT = 80
@@ -35,10 +41,14 @@ ST7735_HEIGHT = 80
 #                H E L P E R   C L A S S E S
 # =========================================================
 class FakeSubST7735:
-    def __init__(self):
+    def __init__(self, *args, fake=True, **kwargs):
+        # Set 'fake=False' to mimic a physical LCD, which makes 'Enviro'
+        # render and send frames just like it would on real hardware.
         self.width = ST7735_WIDTH
         self.height = ST7735_HEIGHT
-        self.fake = True
+        self.fake = fake
+        self._dc = kwargs.get('dc', 9)
+        self._rotation = kwargs.get('rotation', 90)
 
     @staticmethod
     def begin():
@@ -48,6 +58,14 @@ class FakeSubST7735:
     def display(*args, **kwargs):
         pass
 
+    @staticmethod
+    def set_window(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def data(*args, **kwargs):
+        pass
+
     @staticmethod
     def display_on():
         pass
@@ -60,7 +78,7 @@ class FakeSubST7735:
 class FakeST7735:
     @staticmethod
     def ST7735(*args, **kwargs):
-        return FakeSubST7735()
+        return FakeSubST7735(*args, **kwargs)
 
 
 class FakeLTR559:
@@ -73,7 +91,7 @@ class FakeLTR559:
 
     @staticmethod
     def get_lux():
-        return random.randint(1, int(LTR559_LUX_MAX) * 100) / 100
+        return round(random.uniform(LTR559_LUX_MIN, LTR559_LUX_MAX), 2)
 
 
 class FakeSMBus:
@@ -84,25 +102,30 @@ class FakeSMBus:
 class FakeBME280:
     def __init__(self, *args, **kwargs):
         self.active = True
+        self.temperature = float(BME280_TEMP_MIN)
+        self.pressure = float(BME280_PRESS_MIN)
+        self.humidity = float(BME280_HUMID_MIN)
 
-    @staticmethod
-    def get_temperature():
-        return random.randint(BME280_TEMP_MIN * 10, BME280_TEMP_MAX * 10) / 10
+    def update_sensor(self):
+        self.temperature = round(random.uniform(BME280_TEMP_MIN, BME280_TEMP_MAX), 1)
+        self.pressure = round(random.uniform(BME280_PRESS_MIN, BME280_PRESS_MAX), 1)
+        self.humidity = round(random.uniform(BME280_HUMID_MIN, BME280_HUMID_MAX), 1)
 
-    @staticmethod
-    def get_pressure():
-        return random.randint(BME280_PRESS_MIN * 10, BME280_PRESS_MAX * 10) / 10
+    def get_temperature(self):
+        self.update_sensor()
+        return self.temperature
 
-    @staticmethod
-    def get_humidity():
-        return random.randint(BME280_HUMID_MIN * 10, BME280_HUMID_MAX * 10) / 10
+    def get_pressure(self):
+        self.update_sensor()
+        return self.pressure
 
+    def get_humidity(self):
+        self.update_sensor()
+        return self.humidity
 
-class FakeGasData:
-    def __init__(self):
-        self.oxidising = random.randint(10000, 24000)  # TODO: fix magic num
-        self.reducing = random.randint(10000, 24000)  # TODO: fix magic num
-        self.nh3 = random.randint(10000, 24000)  # TODO: fix magic num
+
+# Gas sensor readings
+FakeGasData = namedtuple('FakeGasData', 'oxidising reducing nh3')
 
 
 class FakeEnviroPlus:
@@ -111,17 +134,24 @@ class FakeEnviroPlus:
 
     @staticmethod
     def read_all():
-        return FakeGasData()
+        return FakeGasData(*(random.randint(GAS_MIN, GAS_MAX) for _ in FakeGasData._fields))
 
 
 class FakePMS5003Data:
     def __init__(self, *args, **kwargs):
+        # Like the real sensor, we generate all values once per read. So
+        # repeat calls to 'pm_ug_per_m3()' return same values for same read.
         self.active = True
         self.data = float(PMS5003_MIN)
-
-    @staticmethod
-    def pm_ug_per_m3(*args):
-        return random.randint(int(PMS5003_MIN * 10), int(PMS5003_MAX * 10)) / 10
+        self._pm = {
+            size: round(random.uniform(PMS5003_MIN, PMS5003_MAX), 1)
+            for size in PMS5003_SIZES
+        }
+
+    def pm_ug_per_m3(self, size=1.0, *args):
+        if size not in self._pm:
+            raise ValueError(f"Particle size {size} measurement not available.")
+        return self._pm[size]
 
 
 class FakePMS5003:
@@ -8,8 +8,16 @@ However, many tests can be run without the attached hardware
 using the mock unit.
 """
 
+import threading
+import time
+
+from collections import namedtuple
+
 import pytest
-from src.f451_enviro.enviro import Enviro
+import src.f451_enviro.enviro as enviro
+from src.f451_enviro.enviro import Enviro, load_settings, prep_data
+from src.f451_enviro.enviro_data import DataUnit
+from src.f451_enviro.fake_HAT import FakeSubST7735
 
 
 # =========================================================
@@ -53,6 +61,15 @@ def config():
     }
 
 
+@pytest.fixture
+def physical_LCD(mocker):
+    """Make 'Enviro' use fake LCD that acts like a physical LCD"""
+    mocker.patch(
+        "src.f451_enviro.enviro.ST7735.ST7735",
+        side_effect=lambda *args, **kwargs: FakeSubST7735(*args, fake=False, **kwargs),
+    )
+
+
 @pytest.fixture(scope="session")
 def device_default():
     device = Enviro()
@@ -76,12 +93,131 @@ def test_dummy(valid_str):
     assert valid_str == "Hello world"
 
 
+def test_prep_data():
+    raw = DataUnit([None, 250, 300, 1100, 1300], (260, 1260), 'hPa', 'Pressure', [1, 2, 3, 4])
+    clean = prep_data(raw)
+    assert clean.data == [0, 0, 300, 1100, 0]
+    assert clean.label == raw.label
+
+    clean = prep_data(raw, 2)
+    assert clean.data == [1100, 0]
+
+    noRange = raw._replace(valid=(None, None))
+    assert prep_data(noRange).data == raw.data
+
+    minOnly = raw._replace(valid=(260, None))
+    assert prep_data(minOnly).data == [0, 0, 300, 1100, 1300]
+
+    zeroMin = raw._replace(data=[-5, 0, 50, float('nan'), 101], valid=(0, 100))
+    assert prep_data(zeroMin).data == [0, 0, 50, 0, 0]
+
+
+def test_prep_data_outliers():
+    raw = DataUnit([10, 11, None, 12, 95, 11, 10, 2000], (0, 1000), 'u', 'Test', [1, 2, 3, 4])
+    clean = prep_data(raw, iqrFactor=1.5)
+    assert clean.data == [10, 11, 11.5, 12, 11.5, 11, 10, 10]
+
+    # Data sets that are empty or shorter than smoothing window
+    def _clean(data, smoothWin=3):
+        raw = DataUnit(data, (0, 1000), 'u', 'Test', [1, 2, 3, 4])
+        return prep_data(raw, iqrFactor=1.5, smoothWin=smoothWin).data
+
+    assert _clean([]) == []
+    assert _clean([5]) == [5]
+    assert _clean([None]) == [0]
+    assert _clean([10, None]) == [10, 10]
+    assert _clean([10, None, 12], smoothWin=5) == [10, 11, 12]
+
+
+def test_load_settings(tmp_path):
+    settingsFile = tmp_path / 'settings.toml'
+    settingsFile.write_text('ROTATION = 90\n')
+    settings = load_settings(settingsFile)
+    assert settings == {'ROTATION': 90}
+
+    settings['ROTATION'] = 0
+    assert load_settings(settingsFile) == {'ROTATION': 90}
+
+    settingsFile.write_text('ROTATION = 90\n[LCD]\nSLEEP = 60\n')
+    load_settings(settingsFile)['LCD']['SLEEP'] = 0
+    assert load_settings(settingsFile) == {'ROTATION': 90, 'LCD': {'SLEEP': 60}}
+
+    settingsFile.write_text('ROTATION = 180\nSLEEP = 60\n')
+    assert load_settings(settingsFile) == {'ROTATION': 180, 'SLEEP': 60}
+
+    settingsFile.write_text('ROTATION = ')
+    with pytest.raises(ValueError):
+        load_settings(settingsFile)
+
+
+def test_get_rgb():
+    assert Enviro._get_rgb(0.0) == (0, 102, 255)
+    assert Enviro._get_rgb(1.0) == (255, 0, 0)
+
+
+def test_get_rgb_from_map():
+    ColorMap = namedtuple('ColorMap', 'high normal low')
+    colorMap = ColorMap('H', 'N', 'L')
+    limits = [10, 20.04, 30, 40]
+    assert [Enviro._get_rgb_from_map(v, limits, colorMap) for v in (5, 20, 20.1, 30, 31)] == [
+        'L', 'L', 'N', 'N', 'H'
+    ]
+    assert [Enviro._get_rgb_from_map(v, limits, None) for v in (10, 15, 25, 35, 45)] == [
+        (0, 0, 255), (0, 255, 255), (0, 255, 0), (255, 255, 0), (255, 0, 0)
+    ]
+
+
+def test_display_as_graph_palette(config, physical_LCD):
+    testDev = Enviro(config)
+    testDev.display_init()
+    data = DataUnit([5, 15, 25, 35, 45] * 32, (0, 50), 'u', 'Test', [10, 20, 30, 40])
+    testDev.display_as_graph(data, minMax=(0, 50))
+    assert [testDev._img.getpixel((x, 79)) for x in range(5)] == [
+        (0, 0, 255), (0, 255, 255), (0, 255, 0), (255, 255, 0), (255, 0, 0)
+    ]
+
+
+def test_display_as_graph_nan(config, physical_LCD):
+    testDev = Enviro(config)
+    testDev.display_init()
+
+    # 'NaN' is shown like 'default' value: shortest bar in lowest color band
+    data = DataUnit([float('nan')] + [45] * 159, (None, None), 'u', 'Test', [10, 20, 30, 40])
+    testDev.display_as_graph(data)
+    assert testDev._img.getpixel((0, 79)) == (0, 0, 255)
+    assert testDev._img.getpixel((0, 58)) == (0, 0, 0)
+    assert testDev._img.getpixel((0, 59)) == (0, 0, 255)
+
+    # Same without limits, where colors come from HSV lookup table
+    data = DataUnit([float('nan')] + [45] * 159, (None, None), 'u', 'Test', [None] * 4)
+    testDev.display_as_graph(data)
+    assert testDev._img.getpixel((0, 58)) == (0, 0, 0)
+    assert testDev._img.getpixel((0, 59)) != (0, 0, 0)
+
+
 def test_get_CPU_temp_mock(device_default, mocker):
     mocker.patch("src.f451_enviro.enviro.Enviro.get_CPU_temp", return_value=BME280_TEMP_MIN)
     cpuTemp = device_default.get_CPU_temp()
     assert cpuTemp == BME280_TEMP_MIN
 
 
+def test_get_CPU_temp_sysfs(device_default, tmp_path, monkeypatch):
+    tempFile = tmp_path / "temp"
+    tempFile.write_text("48912\n")
+    monkeypatch.setattr("src.f451_enviro.enviro.CPU_TEMP_FILE", str(tempFile))
+    assert device_default.get_CPU_temp(raw=True) == 48.912
+
+    # Cached value is used until TTL expires
+    tempFile.write_text("50000\n")
+    assert device_default.get_CPU_temp() == 48.912
+    assert device_default.get_CPU_temp(raw=True) == 50.0
+
+    monkeypatch.setattr("src.f451_enviro.enviro.CPU_TEMP_FILE", str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError):
+        device_default.get_CPU_temp(raw=True)
+    assert device_default.get_CPU_temp(strict=False, raw=True) >= float(BME280_TEMP_MIN)
+
+
 @pytest.mark.hardware
 def test_get_CPU_temp(device_default):
     try:
@@ -180,12 +316,66 @@ def test_get_particles_mock(device_default, mocker):
     assert particles.data == float(PMS5003_MIN)
 
 
+def test_get_particles_background(config, mocker):
+    testDev = Enviro({**config, 'PMS_THREAD': 1})
+    spy = mocker.spy(testDev._PMS5003, 'read')
+    particles = testDev.get_particles()
+    assert particles.data >= float(PMS5003_MIN)
+    assert testDev.get_particles() is not None
+    assert spy.call_count >= 1
+
+
+def test_get_particles_background_once(config, mocker):
+    testDev = Enviro({**config, 'PMS_THREAD': 1})
+    barrier = threading.Barrier(8)
+
+    def _get_particles():
+        barrier.wait()
+        testDev.get_particles()
+
+    callers = [threading.Thread(target=_get_particles) for _ in range(8)]
+
+    # Slow down thread creation to widen the window for a start-up race
+    realThread = threading.Thread
+
+    def _slow_thread(*args, **kwargs):
+        time.sleep(0.05)
+        return realThread(*args, **kwargs)
+
+    newThread = mocker.patch('threading.Thread', side_effect=_slow_thread)
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert newThread.call_count == 1
+
+
 @pytest.mark.hardware
 def test_get_particles(device_default):
     particles = device_default.get_particles()
     assert particles.data >= float(PMS5003_MIN)
 
 
+def test_get_temperature_cached(device_default, mocker):
+    spy = mocker.spy(device_default._BME280, "update_sensor")
+    temperature = device_default.get_temperature(raw=True)
+    assert device_default.get_temperature() == temperature
+    assert spy.call_count == 1
+
+    device_default.get_temperature(raw=True)
+    assert spy.call_count == 2
+
+
+def test_read_snapshot(device_default):
+    snapshot = device_default.read_snapshot()
+    assert BME280_TEMP_MIN <= snapshot.temperature <= BME280_TEMP_MAX
+    assert BME280_PRESS_MIN <= snapshot.pressure <= BME280_PRESS_MAX
+    assert BME280_HUMID_MIN <= snapshot.humidity <= BME280_HUMID_MAX
+    assert snapshot.proximity >= 0
+    assert snapshot.timestamp > 0
+
+
 def test_display_init_mock(device_config, mocker):
     testDev = device_config
     mocker.patch("src.f451_enviro.enviro.Enviro.display_init")
@@ -242,6 +432,27 @@ def test_display_sparkle_mock(device_config, mocker):
     pass
 
 
+def test_display_sparkle_max(config, mocker):
+    testDev = Enviro(config)
+    testDev.display_init()
+    spy = mocker.spy(enviro._RANDPOOL, 'randints')
+
+    # Asking for more sparkles than 'maxSparkle' must not always clear the LCD
+    testDev.display_sparkle(num=10000)
+    assert spy.call_args_list[0].args == ((0, 1),)
+
+
+def test_rand_pool_refill():
+    pool = enviro._RandPool(size=4)
+    vals = pool.randints(*[(0, 9)] * 10)
+    assert len(vals) == 10
+    assert all(0 <= val <= 9 for val in vals)
+
+    # Pool is refilled when there are not enough values left
+    vals = pool.randints((5, 5), (5, 5), (5, 5))
+    assert vals == [5, 5, 5]
+
+
 @pytest.mark.skip(reason="TO DO")
 def test_display_as_graph_mock(device_config, mocker):
     pass
@@ -255,3 +466,120 @@ def test_display_as_text_mock(device_config, mocker):
 @pytest.mark.skip(reason="TO DO")
 def test_display_progress_mock(device_config, mocker):
     pass
+
+
+def test_flush_changed_window(config, physical_LCD, mocker):
+    testDev = Enviro(config)
+    testDev.display_init()
+    mocker.patch.object(testDev._LCD, 'set_window')
+    mocker.patch.object(testDev._LCD, 'data')
+
+    testDev._flush()
+    testDev._LCD.set_window.assert_called_once_with(0, 0, 79, 159)
+    assert len(testDev._LCD.data.call_args.args[0]) == ST7735_WIDTH * ST7735_HEIGHT * 2
+
+    testDev._LCD.set_window.reset_mock()
+    testDev._LCD.data.reset_mock()
+    testDev._flush()
+    testDev._LCD.set_window.assert_not_called()
+
+    # Pixel at (x=3, y=5) on LCD rotated 90 degrees
+    testDev._draw.point((3, 5), (255, 255, 255))
+    testDev._flush()
+    testDev._LCD.set_window.assert_called_once_with(5, 156, 5, 156)
+    testDev._LCD.data.assert_called_once_with([0xFF, 0xFF])
+
+
+def test_flush_async(config, physical_LCD, mocker):
+    testDev = Enviro({**config, 'ASYNC_FLUSH': 1})
+    testDev.display_init()
+    mocker.patch.object(testDev._LCD, 'set_window')
+    mocker.patch.object(testDev._LCD, 'data')
+
+    testDev._flush()
+    for _ in range(100):
+        if testDev._LCD.data.called:
+            break
+        time.sleep(0.01)
+
+    testDev._LCD.set_window.assert_called_once_with(0, 0, 79, 159)
+
+
+def test_display_as_text_layout(config, mocker):
+    testDev = Enviro(config)
+    testDev.display_init()
+    mocker.patch.object(testDev, '_flush')
+    mocker.patch.object(testDev._draw, 'text')
+
+    item = {'dataPt': 1.0, 'label': 'Test', 'unit': 'u', 'limits': [None], 'colorMap': None}
+    testDev.display_as_text([item] * 3)
+    assert [c.args[0] for c in testDev._draw.text.call_args_list] == [(1, 1), (1, 41), (81, 1)]
+
+
+def test_flush_spi_write(config, physical_LCD, mocker):
+    gpio = mocker.patch('src.f451_enviro.enviro.ST7735.GPIO', create=True)
+    testDev = Enviro(config)
+    testDev._spiWrite = mocker.Mock()
+    testDev.display_init()
+
+    testDev._flush()
+    gpio.output.assert_called_with(9, True)
+    assert testDev._spiWrite.call_args.args[0] == bytes(ST7735_WIDTH * ST7735_HEIGHT * 2)
+
+
+def test_display_rotate(config, physical_LCD, mocker):
+    testDev = Enviro(config)
+    mocker.patch.object(testDev, '_init_LCD')
+
+    testDev.display_rotate(1)
+    testDev._init_LCD.assert_not_called()
+    assert testDev.displRotation == testDev._LCD._rotation == 180
+
+    testDev.display_rotate(-1, step180=True)
+    assert testDev.displRotation == testDev._LCD._rotation == 0
+
+
+def test_flush_fake_LCD(config, mocker):
+    testDev = Enviro(config)
+    testDev.display_init()
+    spy = mocker.spy(enviro, '_to_RGB565')
+    mocker.patch.object(testDev._LCD, 'set_window')
+
+    testDev._flush()
+    spy.assert_not_called()
+    testDev._LCD.set_window.assert_not_called()
+
+
+def test_set_display_mode(config):
+    testDev = Enviro(config)
+    testDev.add_displ_modes(['modeA', 'modeB'])
+    testDev.add_displ_modes('modeA')
+    assert testDev.displayModes == ['sparkles', 'modeA', 'modeB']
+
+    testDev.set_display_mode(1)
+    assert testDev.displMode == 'modeA'
+    testDev.set_display_mode(-1)
+    testDev.set_display_mode(-1)
+    assert testDev.displMode == 'modeB'
+    testDev.set_display_mode('modeA')
+    assert testDev.displMode == 'modeA'
+    testDev.set_display_mode('unknown')
+    assert testDev.displMode == 'sparkles'
+
+
+def test_set_display_mode_list(config):
+    testDev = Enviro(config)
+    testDev.displayModes = ['modeA', 'modeB']
+    testDev.set_display_mode(1)
+    assert testDev.displMode == 'modeA'
+    testDev.set_display_mode(1)
+    assert testDev.displMode == 'modeB'
+
+    # Changing list in place must keep mode index in sync
+    testDev.displayModes.insert(0, 'modeC')
+    testDev.set_display_mode(1)
+    assert testDev.displMode == 'modeC'
+    testDev.set_display_mode(-1)
+    assert testDev.displMode == 'modeB'
+    testDev.add_displ_modes('modeC')
+    assert testDev.displayModes == ['modeC', 'modeA', 'modeB']
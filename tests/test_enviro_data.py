@@ -4,6 +4,7 @@ These test cases only use fake/random data to test these
 data structures and associated methods.
 """
 
+import numpy as np
 import pytest
 from src.f451_enviro.enviro_data import EnviroData, TEMP_UNIT_F, TEMP_UNIT_K
 
@@ -74,3 +75,43 @@ def test_convert_data(valid_struct):
     assert tempC['data'][-1] == 100
     assert float(tempF['data'][-1]) == 212.0
     assert float(tempK['data'][-1]) == 373.15
+
+
+def test_label(valid_struct):
+    testData = valid_struct
+
+    assert testData.nh3.as_dict()['label'] == 'Nh3'
+    assert testData.nh3.as_tuple().label == 'Nh3'
+
+    testData.nh3.label = 'ammonia'
+    assert testData.nh3.label == 'ammonia'
+    assert testData.nh3.as_dict()['label'] == 'Ammonia'
+
+
+def test_to_numpy(valid_struct):
+    testData = valid_struct
+
+    testData.pressure.data.append(1013.25)
+    testData.pressure.data.append(None)
+
+    arr = testData.to_numpy('pressure')
+    assert arr.shape == (MAX_LEN,)
+    assert arr[-2] == 1013.25
+    assert np.isnan(arr[-1])
+
+    with pytest.raises(ValueError):
+        testData.to_numpy('unknown')
+
+
+def test_as_list_as_dict(valid_struct):
+    testData = valid_struct
+
+    testData.temperature.data.append(100)
+    testData.pm10.data.append(42)
+
+    dataList = testData.as_list(TEMP_UNIT_F)
+    dataDict = testData.as_dict(TEMP_UNIT_F)
+    assert list(dataDict.values()) == dataList
+    assert dataDict['temperature']['data'][-1] == 212.0
+    assert dataDict['pm10']['data'][-1] == 42
+    assert [item['label'] for item in dataList][:3] == ['Temperature', 'Pressure', 'Humidity']